@@ -45,14 +45,30 @@ class FAQDatabase:
         
         faqs = []
         if results['metadatas'][0]:
-            for metadata in results['metadatas'][0]:
+            distances = results.get('distances') or [[None] * len(results['ids'][0])]
+            for faq_id, metadata, distance in zip(results['ids'][0], results['metadatas'][0], distances[0]):
                 faqs.append({
+                    "id": faq_id,
                     "question": metadata['question'],
-                    "answer": metadata['answer']
+                    "answer": metadata['answer'],
+                    # Cosine similarity (the collection uses cosine distance)
+                    "score": round(1 - distance, 4) if distance is not None else None
                 })
         
         return faqs
     
+    def get_all_faqs(self) -> List[Dict]:
+        """Return every FAQ in the collection without running an embedding query"""
+        results = self.collection.get(include=["metadatas"])
+        return [
+            {
+                "id": faq_id,
+                "question": metadata['question'],
+                "answer": metadata['answer']
+            }
+            for faq_id, metadata in zip(results['ids'], results['metadatas'])
+        ]
+
     def get_collection_count(self) -> int:
         """Get the number of documents in the collection"""
         return self.collection.count()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+DEADLINE_HEADER = "x-request-deadline-ms"
+DEFAULT_DEADLINE_MS = int(os.getenv("ASK_DEADLINE_MS", "9000"))
+MAX_DEADLINE_MS = int(os.getenv("ASK_MAX_DEADLINE_MS", "30000"))
+MIN_DEADLINE_MS = 100
+
+# Remote generation is skipped when less than this is left of the budget
+MIN_GENERATION_MS = int(os.getenv("MIN_GENERATION_MS", "1500"))
+# Time kept back from generation for the local fallback and serialization
+FALLBACK_RESERVE_MS = int(os.getenv("FALLBACK_RESERVE_MS", "100"))
+
+
+class DeadlineExceeded(Exception):
+    """The request ran past its deadline before any answer was available"""
+
+
+class ClientDisconnected(Exception):
+    """The client went away while the request was being processed"""
+
+
+class Deadline:
+    """Absolute time budget for one request, shared by every pipeline stage"""
+
+    def __init__(self, budget_ms: int):
+        self.budget_ms = budget_ms
+        self.expires_at = time.monotonic() + budget_ms / 1000
+        self._cancelled = False
+
+    @classmethod
+    def from_headers(cls, headers) -> "Deadline":
+        """Budget from the X-Request-Deadline-Ms header, else ASK_DEADLINE_MS"""
+        try:
+            budget_ms = int(headers.get(DEADLINE_HEADER, DEFAULT_DEADLINE_MS))
+        except ValueError:
+            budget_ms = DEFAULT_DEADLINE_MS
+        return cls(min(max(budget_ms, MIN_DEADLINE_MS), MAX_DEADLINE_MS))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        """Stop further work; stages see no time remaining"""
+        self._cancelled = True
+
+    def remaining(self) -> float:
+        """Seconds left, or 0 once expired or cancelled"""
+        if self._cancelled:
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def overdue(self) -> float:
+        """Seconds past the deadline (negative while time remains)"""
+        return time.monotonic() - self.expires_at
+
+
+class DeadlineMetrics:
+    """Counts of deadline-driven degradations and cancellations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def record(self, reason: str):
+        with self._lock:
+            self._counts[reason] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+deadline_metrics = DeadlineMetrics()
+
+
+async def run_until_disconnect(coro, request, deadline: Deadline,
+                               poll_interval: float = 0.1, grace: float = 0.5):
+    """Await `coro`, cancelling it if the client disconnects or the deadline passes
+
+    The pipeline degrades on its own as the deadline approaches; the hard stop
+    `grace` seconds after expiry is a safety net.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                deadline.cancel()
+                deadline_metrics.record("client_disconnected")
+                raise ClientDisconnected()
+            if deadline.overdue() > grace:
+                deadline.cancel()
+                deadline_metrics.record("hard_timeout")
+                raise DeadlineExceeded(f"No answer within {deadline.budget_ms}ms")
+    finally:
+        if not task.done():
+            task.cancel()
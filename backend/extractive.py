@@ -0,0 +1,82 @@
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "if", "of", "to", "in", "on", "at", "for", "with",
+    "by", "from", "about", "as", "into", "is", "are", "was", "were", "be", "been", "am",
+    "do", "does", "did", "can", "could", "will", "would", "should", "may", "might", "must",
+    "i", "me", "my", "we", "our", "you", "your", "it", "its", "they", "them", "their",
+    "this", "that", "these", "those", "what", "which", "who", "whom", "how", "when",
+    "where", "why", "there", "here", "have", "has", "had", "any", "some", "please", "get",
+}
+
+
+def _stem(word: str) -> str:
+    """Very light suffix stripping so 'returns', 'returned' and 'return' match"""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text: str) -> List[str]:
+    return [_stem(word) for word in _TOKEN.findall(text.lower()) if word not in STOPWORDS]
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text.strip()) if sentence.strip()]
+
+
+def extract_answer(question: str, faqs: List[Dict], max_sentences: int = 2) -> Tuple[Optional[str], float]:
+    """Assemble a short answer from the sentences of retrieved FAQ answers
+
+    Sentences are scored by the IDF-weighted share of question terms they cover,
+    plus how well their FAQ's own question matches and a small bonus for the
+    retrieval rank. Returns the answer and a confidence in [0, 1], or
+    (None, 0.0) when no sentence shares a term with the question.
+    """
+    question_terms = set(terms(question))
+    if not question_terms or not faqs:
+        return None, 0.0
+
+    candidates = []
+    for rank, faq in enumerate(faqs):
+        faq_terms = set(terms(faq.get("question", "")))
+        for position, sentence in enumerate(split_sentences(faq.get("answer", ""))):
+            candidates.append((rank, position, sentence, set(terms(sentence)), faq_terms))
+
+    # IDF over the candidate pool so terms shared by every sentence count for little
+    document_frequency = {}
+    for *_, sentence_terms, _ in candidates:
+        for term in sentence_terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+    idf = {term: math.log(1 + len(candidates) / document_frequency.get(term, 0.5)) for term in question_terms}
+    total_weight = sum(idf.values())
+
+    def coverage(found_terms):
+        return sum(idf[term] for term in question_terms & found_terms) / total_weight
+
+    scored = []
+    for rank, position, sentence, sentence_terms, faq_terms in candidates:
+        sentence_coverage = coverage(sentence_terms)
+        faq_coverage = coverage(faq_terms)
+        score = 0.6 * sentence_coverage + 0.3 * faq_coverage + 0.1 / (rank + 1)
+        scored.append((score, sentence_coverage, faq_coverage, rank, position, sentence))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    best_score, best_sentence_coverage, best_faq_coverage, best_rank = scored[0][:4]
+    if best_sentence_coverage == 0 and best_faq_coverage == 0:
+        return None, 0.0
+
+    # Keep sentences close to the best one, taken from the best FAQ first so the
+    # answer reads as one coherent passage, then restore their original order
+    chosen = [item for item in scored if item[0] >= 0.5 * best_score and item[3] == best_rank][:max_sentences]
+    chosen.sort(key=lambda item: item[4])
+    answer = " ".join(item[5] for item in chosen)
+
+    confidence = min(1.0, max(best_sentence_coverage, best_faq_coverage))
+    return answer, round(confidence, 3)
@@ -1,9 +1,15 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, Depends, Query
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Optional
 import os
 import sys
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 from langsmith import traceable
@@ -14,9 +20,22 @@ current_dir = Path(__file__).parent
 sys.path.append(str(current_dir))
 
 from database import FAQDatabase
+from request_logging import RequestLog, current_request_id, request_logger, setup_request_logging, logging_stats
+from responses import FAQResponse, CachedPayload, dumps, encode_response, parse_fields, shape_payload
+from suggest import SuggestionIndex
+from extractive import extract_answer
+from routing import QueryRouter, load_policy
+from deadlines import (
+    Deadline, DeadlineExceeded, ClientDisconnected, deadline_metrics, run_until_disconnect,
+    DEFAULT_DEADLINE_MS, MIN_GENERATION_MS, FALLBACK_RESERVE_MS
+)
+import profiling
 
 load_dotenv()
 
+# Structured request logs are queued and written by a background thread
+request_log_listener = setup_request_logging()
+
 # Initialize LangSmith if available
 langsmith_enabled = False
 try:
@@ -40,12 +59,35 @@ app.add_middleware(
 # Initialize database
 db = FAQDatabase()
 
+# Type-ahead index over FAQ questions, built at startup once the database is populated
+suggestion_index = SuggestionIndex()
+
 # AI Components - initialize separately
 openai_available = False
 gemini_available = False
 llm_chain = None
 gemini_model = None
 working_model = None
+# OpenAI client limits: the SDK retries twice by default, which would outlive the request deadline
+openai_request_timeout = float(os.getenv("OPENAI_REQUEST_TIMEOUT", "8"))
+openai_max_retries = int(os.getenv("OPENAI_MAX_RETRIES", "0"))
+# Gemini model name -> whether it answered a startup probe
+probed_gemini_models = {}
+
+def probe_gemini_model(model_name: str):
+    """Return a GenerativeModel if `model_name` answers a test prompt, else None"""
+    try:
+        print(f"🧪 Trying model: {model_name}")
+        test_model = genai.GenerativeModel(model_name)
+        # Test with a simple generation
+        test_response = test_model.generate_content("Hello")
+        if test_response.text:
+            probed_gemini_models[model_name] = True
+            return test_model
+    except Exception as model_error:
+        print(f"❌ Model {model_name} failed: {model_error}")
+    probed_gemini_models[model_name] = False
+    return None
 
 # Try to initialize OpenAI/LangChain (skip if problematic)
 if os.getenv("OPENAI_API_KEY"):
@@ -57,7 +99,9 @@ if os.getenv("OPENAI_API_KEY"):
         llm = OpenAI(
             temperature=0.7,
             openai_api_key=os.getenv("OPENAI_API_KEY"),
-            model_name="gpt-3.5-turbo-instruct"
+            model_name="gpt-3.5-turbo-instruct",
+            request_timeout=openai_request_timeout,
+            max_retries=openai_max_retries
         )
 
         prompt_template = PromptTemplate(
@@ -100,19 +144,12 @@ if os.getenv("GOOGLE_API_KEY"):
         working_model = None
 
         for model_name in model_names_to_try:
-            try:
-                print(f"🧪 Trying model: {model_name}")
-                test_model = genai.GenerativeModel(model_name)
-                # Test with a simple generation
-                test_response = test_model.generate_content("Hello")
-                if test_response.text:
-                    gemini_model = test_model
-                    working_model = model_name
-                    print(f"✅ Working model found: {model_name}")
-                    break
-            except Exception as model_error:
-                print(f"❌ Model {model_name} failed: {model_error}")
-                continue
+            test_model = probe_gemini_model(model_name)
+            if test_model:
+                gemini_model = test_model
+                working_model = model_name
+                print(f"✅ Working model found: {model_name}")
+                break
 
         if gemini_model:
             gemini_available = True
@@ -128,6 +165,51 @@ else:
     print("⚠️  No GOOGLE_API_KEY found")
     gemini_available = False
 
+# Local extractive answers need no network: "fallback" runs them after the remote
+# LLMs, "primary" tries them first and keeps confident answers, "only" never calls
+# a remote LLM (offline tests and benchmarks)
+extractive_mode = os.getenv("EXTRACTIVE_MODE", "fallback").lower()
+if extractive_mode not in ("fallback", "primary", "only"):
+    print(f"⚠️  Unknown EXTRACTIVE_MODE '{extractive_mode}', using 'fallback'")
+    extractive_mode = "fallback"
+extractive_min_confidence = float(os.getenv("EXTRACTIVE_MIN_CONFIDENCE", "0.6"))
+
+# OpenAI chains and Gemini models for non-default route settings, created on first use
+openai_chains = {}
+gemini_models = {}
+
+def get_openai_chain(model_name: Optional[str] = None, max_tokens: Optional[int] = None,
+                     temperature: Optional[float] = None):
+    """Return the default LLMChain, or a cached chain with other generation settings"""
+    if not llm_chain:
+        return None
+    if model_name is None and max_tokens is None and temperature is None:
+        return llm_chain
+
+    key = (model_name, max_tokens, temperature)
+    if key not in openai_chains:
+        llm_settings = {
+            "temperature": 0.7 if temperature is None else temperature,
+            "openai_api_key": os.getenv("OPENAI_API_KEY"),
+            "model_name": model_name or "gpt-3.5-turbo-instruct",
+            "request_timeout": openai_request_timeout,
+            "max_retries": openai_max_retries
+        }
+        if max_tokens is not None:
+            llm_settings["max_tokens"] = max_tokens
+        openai_chains[key] = LLMChain(llm=OpenAI(**llm_settings), prompt=prompt_template)
+    return openai_chains[key]
+
+def get_gemini_model(model_name: Optional[str] = None):
+    """Return the probed Gemini model, or a cached model with another name"""
+    if not gemini_model:
+        return None
+    if model_name is None or model_name == working_model:
+        return gemini_model
+    if model_name not in gemini_models:
+        gemini_models[model_name] = genai.GenerativeModel(model_name)
+    return gemini_models[model_name]
+
 # Gemini response function with LangSmith tracking
 @traceable(
     name="gemini_generate_response",
@@ -137,11 +219,14 @@ else:
         "framework": "direct_api"
     }
 )
-def generate_gemini_response(question: str, context: str) -> str:
+def generate_gemini_response(question: str, context: str, model_name: Optional[str] = None,
+                             max_output_tokens: int = 500, temperature: float = 0.7) -> str:
     """Generate response using Google Gemini with LangSmith tracking"""
-    if not gemini_model:
-        print("❌ Gemini model not initialized")
+    model = get_gemini_model(model_name)
+    if not model:
+        request_logger.warning("gemini_not_initialized")
         return None
+    model_name = model_name or working_model
 
     try:
         # Create comprehensive prompt
@@ -156,60 +241,142 @@ Please provide a clear, concise, and helpful response. If the FAQ context doesn'
 
 Response:"""
 
-        print(f"🚀 Sending to Gemini ({working_model})...")
+        request_logger.debug("gemini_request", extra={"provider_event": {"model": model_name}})
 
         # Configure generation parameters
         generation_config = genai.types.GenerationConfig(
-            temperature=0.7,
-            max_output_tokens=500,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
             top_p=0.9,
             top_k=40
         )
 
-        response = gemini_model.generate_content(
+        response = model.generate_content(
             prompt,
             generation_config=generation_config
         )
 
         if hasattr(response, 'text') and response.text:
-            print(f"✅ Got Gemini response: {len(response.text)} chars")
+            request_logger.debug("gemini_response", extra={"provider_event": {"model": model_name, "chars": len(response.text)}})
             return response.text.strip()
         else:
-            print(f"❌ No text in Gemini response")
+            request_logger.warning("gemini_empty_response", extra={"provider_event": {"model": model_name}})
             return None
 
     except Exception as e:
-        print(f"❌ Gemini error: {e}")
+        request_logger.warning("gemini_error", extra={"provider_event": {"model": model_name, "error": str(e)}})
         # Re-raise for LangSmith to track the error
         raise e
 
 # OpenAI response function (already tracked by LangChain)
-def generate_openai_response(question: str, context: str) -> str:
+def generate_openai_response(question: str, context: str, model_name: Optional[str] = None,
+                             max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> str:
     """Generate response using OpenAI/LangChain (automatically tracked)"""
     if not llm_chain:
         return None
 
     try:
-        response = llm_chain.run(question=question, context=context)
+        chain = get_openai_chain(model_name, max_tokens, temperature)
+        response = chain.run(question=question, context=context)
         return response.strip() if response else None
 
     except Exception as e:
-        print(f"OpenAI generation error: {e}")
         # Check if it's a quota error
-        if "quota" in str(e).lower() or "insufficient" in str(e).lower():
-            print("🚫 OpenAI quota exceeded - falling back to Gemini")
+        quota_exceeded = "quota" in str(e).lower() or "insufficient" in str(e).lower()
+        request_logger.warning("openai_error", extra={"provider_event": {"error": str(e), "quota_exceeded": quota_exceeded}})
         return None
 
-class QuestionRequest(BaseModel):
-    question: str
+# Query-complexity routing: providers registered here are tried per route policy
+def route_openai(question: str, context: str, target: dict) -> Optional[str]:
+    return generate_openai_response(
+        question, context,
+        model_name=target.get("model"),
+        max_tokens=target.get("max_output_tokens"),
+        temperature=target.get("temperature")
+    )
+
+def route_gemini(question: str, context: str, target: dict) -> Optional[str]:
+    return generate_gemini_response(
+        question, context,
+        model_name=target.get("model"),
+        max_output_tokens=target.get("max_output_tokens", 500),
+        temperature=target.get("temperature", 0.7)
+    )
+
+try:
+    routing_policy = load_policy()
+except Exception as e:
+    print(f"⚠️  Invalid ROUTING_POLICY, using defaults: {e}")
+    routing_policy = load_policy("")
+
+# Route targets naming a Gemini model the startup probe did not validate are
+# probed now; ones that fail fall back to the probed working model
+if gemini_available:
+    for route_targets in routing_policy["routes"].values():
+        for target in route_targets:
+            model_name = target.get("model")
+            if target["provider"] != "gemini" or model_name in (None, working_model):
+                continue
+            if model_name not in probed_gemini_models:
+                probe_gemini_model(model_name)
+            if not probed_gemini_models[model_name]:
+                print(f"⚠️  Routed Gemini model {model_name} unavailable, using {working_model}")
+                target["model"] = None
+
+query_router = QueryRouter(routing_policy, providers={
+    name: provider
+    for name, provider, available in (
+        ("openai", route_openai, openai_available),
+        ("gemini", route_gemini, gemini_available),
+    )
+    if available
+})
+
+# Blocking calls run in thread pools so the event loop stays free. Retrieval has
+# its own pool so provider calls still running after a timeout cannot starve it.
+generation_threads = int(os.getenv("GENERATION_THREADS", "32"))
+retrieval_pool = ThreadPoolExecutor(max_workers=int(os.getenv("RETRIEVAL_THREADS", "8")), thread_name_prefix="faq-retrieval")
+generation_pool = ThreadPoolExecutor(max_workers=generation_threads, thread_name_prefix="faq-generation")
+# One slot per generation call in flight, abandoned ones included; a request that
+# finds them all taken skips remote generation rather than queueing behind them
+generation_slots = threading.BoundedSemaphore(generation_threads)
+
+class WorkersBusy(Exception):
+    """Every slot for a bounded pool is taken"""
+
+async def run_blocking(executor, func, *args, timeout: float, slots=None, **kwargs):
+    """Run `func` in `executor`, giving up after `timeout` seconds
+
+    Python threads cannot be killed, so a call that times out finishes in the
+    background and its result is discarded. With `slots`, raises WorkersBusy
+    when no slot is free; the slot is released when the call actually ends.
+    """
+    if slots is not None and not slots.acquire(blocking=False):
+        raise WorkersBusy()
+    context = contextvars.copy_context()
+
+    def call():
+        if not profiling.enabled:
+            return func(*args, **kwargs)
+        profiling.attach_current_thread()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # The pool thread goes idle or serves other requests from here on
+            profiling.detach_current_thread()
 
-class FAQResponse(BaseModel):
+    try:
+        future = executor.submit(context.run, call)
+    except Exception:
+        if slots is not None:
+            slots.release()
+        raise
+    if slots is not None:
+        future.add_done_callback(lambda _: slots.release())
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+class QuestionRequest(BaseModel):
     question: str
-    answer: str
-    relevant_faqs: List[dict]
-    confidence: Optional[str] = None
-    ai_provider: Optional[str] = None
-    langsmith_enabled: Optional[bool] = None
 
 @app.on_event("startup")
 async def startup_event():
@@ -236,9 +403,22 @@ async def startup_event():
                 print("⚠️  FAQ data file not found")
         else:
             print(f"✅ Database already contains {db.get_collection_count()} entries")
+
+        suggestion_index.build(db.get_all_faqs())
+        print(f"✅ Suggestion index built with {len(suggestion_index)} questions")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
 
+    if profiling.enabled:
+        profiling.loop_lag_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued request logs"""
+    retrieval_pool.shutdown(wait=False)
+    generation_pool.shutdown(wait=False)
+    request_log_listener.stop()
+
 @app.get("/")
 async def root():
     return {
@@ -261,7 +441,8 @@ async def health_check():
         "database_entries": db.get_collection_count(),
         "ai_providers": {
             "openai": openai_available,
-            "gemini": gemini_available
+            "gemini": gemini_available,
+            "extractive": extractive_mode
         },
         "monitoring": {
             "langsmith": langsmith_enabled
@@ -271,93 +452,222 @@ async def health_check():
 
 @traceable(name="faq_bot_conversation")
 @app.post("/ask", response_model=FAQResponse)
-async def ask_question(request: QuestionRequest):
-    """Main FAQ endpoint with full LangSmith tracking"""
+async def ask_question(request: QuestionRequest, http_request: Request,
+                       fields: Optional[str] = None, faqs: Optional[str] = None):
+    """Main FAQ endpoint with full LangSmith tracking
+
+    `fields` is a comma-separated subset of response fields (e.g. `answer,ai_provider`)
+    and `faqs` selects how relevant FAQs are returned: `full` (default), `ids` or `none`.
+    The request budget comes from the X-Request-Deadline-Ms header or ASK_DEADLINE_MS.
+    """
+    # Logged as sent so replay_traffic.py can reproduce the request
+    params = {name: value for name, value in (("fields", fields), ("faqs", faqs)) if value}
     try:
-        # Search for relevant FAQs
-        try:
-            relevant_faqs = db.search_faqs(request.question, n_results=3)
-        except TypeError:
-            try:
-                relevant_faqs = db.search_faqs(request.question, top_k=3)
-            except Exception as e:
-                print(f"Database search error: {e}")
-                relevant_faqs = []
-
-        if not relevant_faqs:
-            return FAQResponse(
-                question=request.question,
-                answer="I don't have information about that specific question. Please contact our support team for assistance.",
-                relevant_faqs=[],
-                confidence="low",
-                ai_provider="none",
-                langsmith_enabled=langsmith_enabled
-            )
-
-        # Create context from relevant FAQs
-        context = "\n".join([
-            f"Q: {faq.get('question', faq.get('metadata', {}).get('question', 'Unknown'))}\nA: {faq.get('answer', faq.get('metadata', {}).get('answer', 'Unknown'))}"
-            for faq in relevant_faqs
-        ])
-
-        # Try AI response generation - OpenAI first, then Gemini fallback
-        ai_response = None
-        ai_provider = "none"
-
-        # Try OpenAI first (automatically tracked by LangChain)
-        if openai_available:
-            ai_response = generate_openai_response(request.question, context)
-            if ai_response:
-                ai_provider = "openai"
-                print(f"✅ OpenAI response generated for: {request.question}")
-
-        # Fallback to Gemini if OpenAI failed (now tracked!)
-        if not ai_response and gemini_available:
-            ai_response = generate_gemini_response(request.question, context)
-            if ai_response:
-                ai_provider = "gemini"
-                print(f"✅ Gemini response generated for: {request.question}")
-
-        # Final fallback to first FAQ if no AI worked
-        if not ai_response:
-            first_faq = relevant_faqs[0]
-            ai_response = first_faq.get('answer', first_faq.get('metadata', {}).get('answer', 'No answer available'))
-            ai_provider = "fallback"
-            print(f"⚠️  Using fallback response for: {request.question}")
-
-        return FAQResponse(
-            question=request.question,
-            answer=ai_response.strip() if isinstance(ai_response, str) else str(ai_response),
-            relevant_faqs=relevant_faqs,
-            confidence="high" if len(relevant_faqs) >= 2 else "medium",
-            ai_provider=ai_provider,
-            langsmith_enabled=langsmith_enabled
-        )
-
+        selected, faqs = parse_fields(fields, faqs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    log = RequestLog("ask", request_id=http_request.headers.get("x-request-id"), question=request.question)
+    # Provider events logged from worker threads carry this id through the copied context
+    current_request_id.set(log.request_id)
+    headers = {"X-Request-ID": log.request_id}
+    deadline = Deadline.from_headers(http_request.headers)
+    log.set(deadline_ms=deadline.budget_ms, params=params)
+    profile = profiling.start_profile() if profiling.enabled and profiling.should_profile(http_request.headers) else None
+    try:
+        result = await run_until_disconnect(answer_question(request.question, log, deadline), http_request, deadline)
+        with log.stage("serialize"):
+            body = dumps(shape_payload(result, selected, faqs))
+    except ClientDisconnected:
+        log.set(outcome="client_disconnected")
+        log.emit(level=logging.WARNING)
+        # Nobody is listening; 499 (client closed request) only shows up in access logs
+        return Response(status_code=499, headers=headers)
+    except DeadlineExceeded as e:
+        log.emit(error=str(e))
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
-        print(f"Error processing question: {str(e)}")
+        log.emit(error=str(e))
         raise HTTPException(status_code=500, detail=f"Error processing question: {str(e)}")
-
-@app.get("/faqs")
-async def get_all_faqs():
-    """Get all available FAQs for reference"""
+    finally:
+        if profile:
+            profile_id = profiling.finish_profile(profile, log.request_id)
+            headers["X-Profile-Id"] = profile_id
+            log.set(profile_id=profile_id)
+
+    log.set(provider=result["ai_provider"], confidence=result["confidence"], response_bytes=len(body))
+    log.emit()
+    if log.fields.get("degraded"):
+        # Lets clients avoid caching an answer the deadline cut short
+        headers["X-Degraded"] = log.fields["degraded"]
+    return encode_response(http_request, body, headers=headers)
+
+def search_relevant_faqs(question: str, request_id: str) -> list:
+    """Search for relevant FAQs"""
     try:
-        count = db.get_collection_count()
-        if count == 0:
-            return {"faqs": [], "message": "No FAQs in database"}
-
+        return db.search_faqs(question, n_results=3)
+    except TypeError:
+        try:
+            return db.search_faqs(question, top_k=3)
+        except Exception as e:
+            request_logger.warning("search_error", extra={"provider_event": {"request_id": request_id, "error": str(e)}})
+            return []
+
+async def answer_question(question: str, log: RequestLog, deadline: Deadline) -> dict:
+    """Retrieve relevant FAQs and generate an answer, recording stage timings on `log`
+
+    Each stage gets what is left of `deadline`. When too little remains for a
+    remote LLM, the answer degrades to the local extractive or retrieved FAQ answer.
+    Returns a plain dict with the FAQResponse fields; it is serialized directly
+    rather than validated through the pydantic model on every request.
+    """
+    with log.stage("retrieval"):
         try:
-            all_faqs = db.search_faqs("", n_results=count)
-        except:
+            relevant_faqs = await run_blocking(retrieval_pool, search_relevant_faqs, question, log.request_id, timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            deadline_metrics.record("retrieval_timeout")
+            raise DeadlineExceeded(f"FAQ search did not finish within {deadline.budget_ms}ms")
+    log.set_retrieved(relevant_faqs)
+    if relevant_faqs and relevant_faqs[0].get("id"):
+        suggestion_index.record_hit(relevant_faqs[0]["id"])
+
+    if not relevant_faqs:
+        return {
+            "question": question,
+            "answer": "I don't have information about that specific question. Please contact our support team for assistance.",
+            "relevant_faqs": [],
+            "confidence": "low",
+            "ai_provider": "none",
+            "langsmith_enabled": langsmith_enabled
+        }
+
+    # Create context from relevant FAQs
+    context = "\n".join([
+        f"Q: {faq.get('question', faq.get('metadata', {}).get('question', 'Unknown'))}\nA: {faq.get('answer', faq.get('metadata', {}).get('answer', 'Unknown'))}"
+        for faq in relevant_faqs
+    ])
+
+    # Try AI response generation - local extractive tier and routed remote LLMs
+    ai_response = None
+    ai_provider = "none"
+    extracted = None
+
+    # Local extractive tier first when configured; remote LLMs only for harder questions
+    if extractive_mode in ("primary", "only"):
+        with log.stage("extractive"):
+            extracted, extractive_confidence = extract_answer(question, relevant_faqs)
+        log.set(extractive_confidence=extractive_confidence)
+        if extracted and (extractive_mode == "only" or extractive_confidence >= extractive_min_confidence):
+            ai_response = extracted
+            ai_provider = "extractive"
+
+    remote_allowed = extractive_mode != "only"
+
+    # Remote LLMs: easy queries go to fast models with a small budget, hard ones to
+    # the larger models, each route falling back through its targets in order
+    if not ai_response and remote_allowed and query_router.providers:
+        route, features = query_router.classify(question, relevant_faqs)
+        log.set(route=route, route_features=features)
+
+        degraded = None
+        generation_budget = deadline.remaining() - FALLBACK_RESERVE_MS / 1000
+        if generation_budget < MIN_GENERATION_MS / 1000:
+            degraded = "generation_skipped"
+        else:
+            # Set once this request stops waiting, so a late provider reply is
+            # recorded as abandoned rather than as a success
+            abandoned = threading.Event()
             try:
-                all_faqs = db.search_faqs("", top_k=count)
-            except:
-                all_faqs = []
+                with log.stage("generation"):
+                    routed_response, routed_provider, attempts = await run_blocking(
+                        generation_pool, query_router.generate, route, question, context,
+                        deadline=deadline, min_attempt_seconds=MIN_GENERATION_MS / 1000,
+                        abandoned=abandoned, timeout=generation_budget, slots=generation_slots
+                    )
+                log.set(attempts=attempts)
+                if routed_response:
+                    ai_response = routed_response
+                    ai_provider = routed_provider
+                elif any(attempt.get("skipped") for attempt in attempts):
+                    degraded = "generation_budget_exhausted"
+            except WorkersBusy:
+                # Earlier calls still hold every generation slot
+                degraded = "generation_skipped"
+                log.set(generation_pool_full=True)
+            except asyncio.TimeoutError:
+                abandoned.set()
+                degraded = "generation_timeout"
+
+        if degraded:
+            deadline_metrics.record(degraded)
+            log.set(degraded=degraded)
+
+    # Extractive answer from the retrieved FAQs if no remote AI worked
+    if not ai_response:
+        if extracted is None and extractive_mode == "fallback":
+            with log.stage("extractive"):
+                extracted, extractive_confidence = extract_answer(question, relevant_faqs)
+            log.set(extractive_confidence=extractive_confidence)
+        if extracted:
+            ai_response = extracted
+            ai_provider = "extractive"
+
+    # Final fallback to first FAQ if nothing matched
+    if not ai_response:
+        first_faq = relevant_faqs[0]
+        ai_response = first_faq.get('answer', first_faq.get('metadata', {}).get('answer', 'No answer available'))
+        ai_provider = "fallback"
+
+    return {
+        "question": question,
+        "answer": ai_response.strip() if isinstance(ai_response, str) else str(ai_response),
+        "relevant_faqs": relevant_faqs,
+        "confidence": "high" if len(relevant_faqs) >= 2 else "medium",
+        "ai_provider": ai_provider,
+        "langsmith_enabled": langsmith_enabled
+    }
 
-        return {"faqs": all_faqs, "count": len(all_faqs)}
+# Serialized /faqs listing; its compressed variants are reused while the content hash is unchanged
+faq_listing_cache: Optional[CachedPayload] = None
+
+@app.get("/faqs")
+async def get_all_faqs(http_request: Request):
+    """Get all available FAQs for reference (supports ETag / If-None-Match)"""
+    global faq_listing_cache
+    log = RequestLog("faqs", request_id=http_request.headers.get("x-request-id"))
+    try:
+        all_faqs = db.get_all_faqs()
+        if all_faqs:
+            payload = {"faqs": all_faqs, "count": len(all_faqs)}
+        else:
+            payload = {"faqs": [], "message": "No FAQs in database"}
+        # The ETag is a hash of the body, so edits that keep the count still invalidate it
+        listing = CachedPayload(payload)
+        if faq_listing_cache is None or faq_listing_cache.etag != listing.etag:
+            faq_listing_cache = listing
+            log.set(cache="miss")
+        else:
+            listing = faq_listing_cache
+            log.set(cache="hit")
     except Exception as e:
+        log.emit(error=str(e))
         raise HTTPException(status_code=500, detail=f"Error retrieving FAQs: {str(e)}")
 
+    headers = {"ETag": listing.etag, "Cache-Control": "no-cache", "X-Request-ID": log.request_id}
+    if listing.matches(http_request.headers.get("if-none-match")):
+        log.set(cache="not_modified")
+        log.emit()
+        return Response(status_code=304, headers=headers)
+
+    log.emit()
+    return encode_response(http_request, listing.body, headers=headers, variants=listing.variants)
+
+@app.get("/suggest")
+async def suggest_questions(q: str = Query("", max_length=200), limit: int = Query(5, ge=1, le=10), fuzzy: int = Query(0, ge=0, le=2)):
+    """Type-ahead FAQ question suggestions from the in-memory prefix index"""
+    suggestions = suggestion_index.suggest(q, limit=limit, fuzzy=fuzzy)
+    return Response(content=dumps({"query": q, "suggestions": suggestions}), media_type="application/json")
+
 @app.get("/debug")
 async def debug_info():
     """Debug endpoint to check system status"""
@@ -372,6 +682,9 @@ async def debug_info():
             "openai_available": openai_available,
             "gemini_available": gemini_available,
             "gemini_model": working_model,
+            "extractive_mode": extractive_mode,
+            "extractive_min_confidence": extractive_min_confidence,
+            "routing_policy": query_router.policy,
             "fallback_mode": not (openai_available or gemini_available)
         },
         "monitoring": {
@@ -380,6 +693,38 @@ async def debug_info():
         "database_count": db.get_collection_count()
     }
 
+def require_admin(request: Request):
+    """Hide admin endpoints unless profiling is enabled and the token matches"""
+    if not profiling.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiling.check_token(request.headers.get("x-admin-token")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/memory", dependencies=[Depends(require_admin)])
+def admin_memory(top: int = 20):
+    """Process RSS, tracemalloc snapshot, component sizes and event-loop lag
+
+    A plain def so FastAPI runs it in the threadpool: deep_sizeof and the
+    ChromaDB directory walk would otherwise block the event loop.
+    """
+    return profiling.memory_report(db, top=top)
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def admin_list_profiles():
+    """List stored request profiles, oldest first"""
+    return {"profiles": profiling.list_profiles()}
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def admin_get_profile(profile_id: str):
+    """Download a request profile in folded-stack format (flamegraph.pl, speedscope)"""
+    folded = profiling.get_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+    )
+
 # Test individual AI providers with tracking
 @traceable(name="test_openai_endpoint")
 @app.post("/test-openai")
@@ -401,6 +746,18 @@ async def test_gemini_response(request: QuestionRequest):
     response = generate_gemini_response(request.question, "Test context")
     return {"provider": "gemini", "response": response, "status": "success" if response else "failed"}
 
+@app.post("/test-extractive")
+async def test_extractive_response(request: QuestionRequest):
+    """Test the local extractive provider against retrieved FAQs"""
+    relevant_faqs = db.search_faqs(request.question, n_results=3)
+    response, confidence = extract_answer(request.question, relevant_faqs)
+    return {
+        "provider": "extractive",
+        "response": response,
+        "confidence": confidence,
+        "status": "success" if response else "failed"
+    }
+
 # New endpoint for LangSmith feedback
 @app.post("/feedback")
 async def submit_feedback(run_id: str, score: float, comment: str = ""):
@@ -435,6 +792,17 @@ async def get_monitoring_stats():
         "database": {
             "entries": db.get_collection_count(),
             "status": "healthy" if db.get_collection_count() > 0 else "empty"
+        },
+        "request_logging": logging_stats(),
+        "deadlines": {
+            "default_ms": DEFAULT_DEADLINE_MS,
+            "min_generation_ms": MIN_GENERATION_MS,
+            "degradations": deadline_metrics.stats()
+        },
+        "routing": {
+            "enabled": query_router.policy.get("enabled", True),
+            "providers": list(query_router.providers),
+            "routes": query_router.metrics.stats()
         }
     }
 
@@ -0,0 +1,256 @@
+import asyncio
+import contextvars
+import gc
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import types
+import uuid
+from collections import Counter, OrderedDict, deque
+from pathlib import Path
+from typing import Dict, Optional
+
+# Everything here is opt-in. With PROFILING_ENABLED unset the request path only
+# checks the `enabled` flag and the admin endpoints answer 404.
+admin_token = os.getenv("PROFILING_TOKEN", "")
+enabled = os.getenv("PROFILING_ENABLED", "false").lower() == "true" and bool(admin_token)
+sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+sample_interval = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+max_stored_profiles = int(os.getenv("PROFILE_MAX_STORED", "20"))
+
+if enabled and os.getenv("PROFILING_TRACEMALLOC", "false").lower() == "true":
+    tracemalloc.start(int(os.getenv("PROFILING_TRACEMALLOC_FRAMES", "1")))
+
+_active_profile: contextvars.ContextVar = contextvars.ContextVar("active_profile", default=None)
+_profiles: "OrderedDict[str, str]" = OrderedDict()
+
+
+def check_token(token: Optional[str]) -> bool:
+    """Constant-time comparison against PROFILING_TOKEN"""
+    return enabled and token is not None and hmac.compare_digest(token, admin_token)
+
+
+class StackSampler:
+    """Sample the Python stacks of selected threads into folded (flamegraph) format
+
+    The thread that starts the sampler is tracked; worker threads doing work for
+    the same request join with `add_current_thread` and leave with
+    `remove_current_thread` once their part is done. Concurrent requests running
+    on the event loop thread appear in the samples too.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.thread_ids = {threading.get_ident()}
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="faq-bot-profiler", daemon=True)
+        self._started = 0.0
+
+    def add_current_thread(self):
+        self.thread_ids.add(threading.get_ident())
+
+    def remove_current_thread(self):
+        self.thread_ids.discard(threading.get_ident())
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the collected stacks as folded text"""
+        self._stop.set()
+        self._thread.join()
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        lines = [f"# wall_ms={elapsed_ms:.1f} interval_ms={self.interval * 1000:g} samples={sum(self.samples.values())}"]
+        lines.extend(f"{stack} {count}" for stack, count in self.samples.most_common())
+        return "\n".join(lines) + "\n"
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[_fold(frame)] += 1
+
+
+def _fold(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+def should_profile(headers) -> bool:
+    """Profile when an admin asks via X-Profile, or at PROFILE_SAMPLE_RATE"""
+    if headers.get("x-profile", "").lower() in ("1", "true") and check_token(headers.get("x-admin-token")):
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def start_profile() -> StackSampler:
+    profile = StackSampler(interval=sample_interval)
+    _active_profile.set(profile)
+    profile.start()
+    return profile
+
+
+def attach_current_thread():
+    """Include the calling thread in the active request profile, if any"""
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.add_current_thread()
+
+
+def detach_current_thread():
+    """Stop sampling the calling thread, e.g. when a pool worker finishes its call"""
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.remove_current_thread()
+
+
+def finish_profile(profile: StackSampler, request_id: str) -> str:
+    """Stop `profile`, keep its output for download and return the profile id"""
+    _active_profile.set(None)
+    profile_id = f"{request_id}-{uuid.uuid4().hex[:8]}"
+    _profiles[profile_id] = profile.stop()
+    while len(_profiles) > max_stored_profiles:
+        _profiles.popitem(last=False)
+    return profile_id
+
+
+def get_profile(profile_id: str) -> Optional[str]:
+    return _profiles.get(profile_id)
+
+
+def list_profiles():
+    return list(_profiles.keys())
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up from a fixed-interval sleep"""
+
+    def __init__(self, interval: float = 0.5, window: int = 120):
+        self.interval = interval
+        self.lags = deque(maxlen=window)
+        self.max_lag = 0.0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def stats(self) -> Dict:
+        if not self.lags:
+            return {"running": self._task is not None, "samples": 0}
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "samples": len(self.lags),
+            "last_ms": round(self.lags[-1] * 1000, 3),
+            "mean_ms": round(sum(self.lags) / len(self.lags) * 1000, 3),
+            "max_ms": round(self.max_lag * 1000, 3),
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()
+
+
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+
+
+def deep_sizeof(obj, max_objects: int = 200_000) -> Dict:
+    """Approximate Python heap size of everything reachable from `obj`
+
+    Native allocations (ONNX runtime, SQLite, hnswlib) are not visible here;
+    compare with the process RSS for the full picture.
+    """
+    seen = set()
+    pending = [obj]
+    total = 0
+    while pending and len(seen) < max_objects:
+        current = pending.pop()
+        # Stop at classes, modules and functions so globals are not counted
+        if id(current) in seen or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+        pending.extend(gc.get_referents(current))
+    return {"python_bytes": total, "objects": len(seen), "truncated": bool(pending)}
+
+
+def _directory_size(path) -> int:
+    root = Path(path).expanduser()
+    if not root.exists():
+        return 0
+    return sum(f.stat().st_size for f in root.rglob("*") if f.is_file())
+
+
+def process_memory() -> Dict:
+    stats = {}
+    try:
+        with open("/proc/self/statm") as f:
+            pages = f.read().split()
+        stats["rss_bytes"] = int(pages[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stats["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    return stats
+
+
+def memory_report(db, top: int = 20) -> Dict:
+    """Process RSS, tracemalloc top allocations and sizes of the heavy components"""
+    report = {"process": process_memory()}
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        report["tracemalloc"] = {
+            "tracing": True,
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top": [
+                {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:top]
+            ],
+        }
+    else:
+        report["tracemalloc"] = {"tracing": False, "hint": "set PROFILING_TRACEMALLOC=true"}
+
+    embedding_function = getattr(db.collection, "_embedding_function", None)
+    embedding = {"type": type(embedding_function).__name__}
+    embedding.update(deep_sizeof(embedding_function))
+    download_path = getattr(embedding_function, "DOWNLOAD_PATH", None)
+    if download_path:
+        embedding["model_files_bytes"] = _directory_size(download_path)
+
+    report["components"] = {
+        "chromadb_client": deep_sizeof(db.client),
+        "embedding_model": embedding,
+    }
+    report["event_loop_lag"] = loop_lag_monitor.stats()
+    return report
@@ -0,0 +1,196 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+LOGGER_NAME = "faq_bot.requests"
+
+# Fields copied from a LogRecord into the JSON line when present
+_RECORD_FIELDS = ("request", "provider_event")
+
+# Id of the request being served; worker threads see it through copied contexts
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+
+
+class JSONFormatter(logging.Formatter):
+    """Render log records as single-line JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "event": record.getMessage(),
+        }
+        for field in _RECORD_FIELDS:
+            value = getattr(record, field, None)
+            if value:
+                payload.update(value)
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload.setdefault("request_id", request_id)
+        sample_weight = getattr(record, "sample_weight", None)
+        if sample_weight:
+            payload["sample_weight"] = sample_weight
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the current request id while still on the logging thread
+
+    The formatter runs on the queue listener's thread, where the request's
+    context is no longer visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = current_request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every record until traffic exceeds `burst_per_second`, then sample
+
+    Warnings and errors are never dropped. Records kept while sampling carry a
+    `sample_weight` (1 / sample_rate) so consumers can tell the log is partial.
+    """
+
+    def __init__(self, sample_rate: float = 0.1, burst_per_second: int = 20):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.burst_per_second = burst_per_second
+        self._window = 0
+        self._count = 0
+        self.dropped = 0
+        # Filters run before the handler lock, on the event loop and worker threads alike
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        window = int(record.created)
+        with self._lock:
+            if window != self._window:
+                self._window = window
+                self._count = 0
+            self._count += 1
+            if self._count <= self.burst_per_second:
+                return True
+            if random.random() < self.sample_rate:
+                record.sample_weight = round(1 / self.sample_rate, 3)
+                return True
+            self.dropped += 1
+            return False
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RequestLog:
+    """Structured record for a single request, emitted once when the request finishes"""
+
+    def __init__(self, endpoint: str, request_id: Optional[str] = None, question: Optional[str] = None):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.fields: Dict = {
+            "request_id": request_id or uuid.uuid4().hex,
+            "endpoint": endpoint,
+            "question": question,
+            "stages_ms": {},
+            "provider": None,
+            "retrieved_ids": [],
+        }
+
+    @property
+    def request_id(self) -> str:
+        return self.fields["request_id"]
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage and record it in milliseconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fields["stages_ms"][name] = round((time.perf_counter() - start) * 1000, 3)
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def set_retrieved(self, faqs: List[Dict]):
+        self.fields["retrieved_ids"] = [faq.get("id") for faq in faqs if faq.get("id")]
+
+    def emit(self, level: int = logging.INFO, error: Optional[str] = None):
+        self.fields["arrived_at"] = round(self.started_at, 6)
+        self.fields["total_ms"] = round((time.perf_counter() - self._start) * 1000, 3)
+        if error:
+            self.fields["error"] = error
+            level = max(level, logging.ERROR)
+        request_logger.log(level, self.fields["endpoint"], extra={"request": self.fields})
+
+
+request_logger = logging.getLogger(LOGGER_NAME)
+request_logger.propagate = False
+
+
+def setup_request_logging() -> logging.handlers.QueueListener:
+    """Route request logs through a bounded queue to a background writer thread
+
+    Configured with REQUEST_LOG_LEVEL, REQUEST_LOG_FILE, REQUEST_LOG_QUEUE_SIZE,
+    REQUEST_LOG_SAMPLE_RATE and REQUEST_LOG_BURST_PER_SECOND.
+    """
+    log_file = os.getenv("REQUEST_LOG_FILE")
+    if log_file:
+        target = logging.FileHandler(log_file, encoding="utf-8")
+    else:
+        target = logging.StreamHandler(sys.stdout)
+    target.setFormatter(JSONFormatter())
+
+    log_queue = queue.Queue(maxsize=int(os.getenv("REQUEST_LOG_QUEUE_SIZE", "10000")))
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(
+        sample_rate=float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "0.1")),
+        burst_per_second=int(os.getenv("REQUEST_LOG_BURST_PER_SECOND", "20")),
+    ))
+
+    request_logger.handlers = [handler]
+    request_logger.setLevel(os.getenv("REQUEST_LOG_LEVEL", "INFO").upper())
+
+    listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=False)
+    listener.start()
+    return listener
+
+
+def logging_stats() -> Dict:
+    """Counters for records dropped by sampling or a full queue"""
+    stats = {"sampled_out": 0, "queue_full": 0}
+    for handler in request_logger.handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            stats["queue_full"] += handler.dropped
+            for log_filter in handler.filters:
+                if isinstance(log_filter, SamplingFilter):
+                    stats["sampled_out"] += log_filter.dropped
+    return stats
@@ -0,0 +1,159 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+# Optional fast paths - fall back to the standard library when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+FAQ_FORMATS = ("full", "ids", "none")
+
+
+class FAQResponse(BaseModel):
+    """Full /ask response; `fields` and `faqs` can leave out any field"""
+    question: Optional[str] = None
+    answer: Optional[str] = None
+    relevant_faqs: Optional[List[dict]] = None
+    relevant_faq_ids: Optional[List[str]] = None
+    confidence: Optional[str] = None
+    ai_provider: Optional[str] = None
+    langsmith_enabled: Optional[bool] = None
+
+
+RESPONSE_FIELDS = set(FAQResponse.model_fields)
+FAQ_FIELDS = {"relevant_faqs", "relevant_faq_ids"}
+
+
+def dumps(payload) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str], faqs: Optional[str] = None) -> Tuple[Optional[Set[str]], str]:
+    """Validate the `?fields=` and `?faqs=` query parameters of /ask
+
+    Returns the selected fields (None for all) and the FAQ format to apply.
+    An explicit field list wins: FAQ data is only returned when
+    `relevant_faqs` or `relevant_faq_ids` is listed, and listing just one of
+    them implies its format. Raises ValueError for unknown field names or
+    FAQ formats, and when `faqs` contradicts the listed FAQ field.
+    """
+    if faqs is not None and faqs not in FAQ_FORMATS:
+        raise ValueError(f"faqs must be one of {', '.join(FAQ_FORMATS)}")
+    if not fields:
+        return None, faqs or "full"
+
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - RESPONSE_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    requested = selected & FAQ_FIELDS
+    if not requested:
+        return selected, "none"
+    if len(requested) == 1:
+        implied = "ids" if "relevant_faq_ids" in requested else "full"
+        if faqs not in (None, implied):
+            raise ValueError(f"fields={requested.pop()} conflicts with faqs={faqs}")
+        return selected, implied
+    # Both listed: `faqs` decides which form is returned
+    return selected, faqs or "full"
+
+
+def shape_payload(payload: Dict, selected: Optional[Set[str]] = None, faqs: str = "full") -> Dict:
+    """Reduce an /ask payload to the selected fields and FAQ format"""
+    shaped = dict(payload)
+    relevant = shaped.pop("relevant_faqs", [])
+    if faqs == "full":
+        shaped["relevant_faqs"] = relevant
+    elif faqs == "ids":
+        shaped["relevant_faq_ids"] = [faq.get("id") for faq in relevant]
+
+    if selected is not None:
+        shaped = {key: value for key, value in shaped.items() if key in selected}
+    return shaped
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=5)
+
+
+def encode_response(request: Request, body: bytes, status_code: int = 200,
+                    headers: Optional[Dict] = None, variants: Optional[Dict] = None) -> Response:
+    """Build a JSON response, compressing it when the client accepts br or gzip
+
+    `variants` caches compressed bodies across calls for payloads that rarely change.
+    """
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+
+    encoding = None
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+
+    if encoding:
+        if variants is None:
+            body = compress(body, encoding)
+        else:
+            if encoding not in variants:
+                variants[encoding] = compress(body, encoding)
+            body = variants[encoding]
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+class CachedPayload:
+    """Serialized body plus ETag for a payload served repeatedly"""
+
+    def __init__(self, payload):
+        self.body = dumps(payload)
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.variants: Dict[str, bytes] = {}
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True when an If-None-Match header covers this payload's ETag"""
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or any(tag.removeprefix("W/") == self.etag for tag in candidates)
@@ -0,0 +1,243 @@
+import copy
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Provider callables take (question, context, target) and return text or None
+Provider = Callable[[str, str, Dict], Optional[str]]
+
+DEFAULT_POLICY = {
+    "enabled": True,
+    "thresholds": {
+        # A retrieved FAQ counts as matched at or above this similarity
+        "match_score": 0.35,
+        # A query is easy when one FAQ clearly wins and the question is short
+        "easy_min_top_score": 0.55,
+        "easy_min_margin": 0.08,
+        "easy_max_query_words": 12,
+        "easy_max_matched": 2,
+    },
+    "routes": {
+        # A named Gemini model is probed at startup and replaced by the probed
+        # working model when it does not respond
+        "easy": [
+            {"provider": "gemini", "model": "gemini-1.5-flash", "max_output_tokens": 150, "temperature": 0.2},
+            {"provider": "openai", "model": "gpt-3.5-turbo-instruct", "max_output_tokens": 150, "temperature": 0.2},
+        ],
+        "hard": [
+            {"provider": "openai", "model": "gpt-3.5-turbo-instruct", "max_output_tokens": 500, "temperature": 0.7},
+            # model None uses the Gemini model found by the startup probe
+            {"provider": "gemini", "model": None, "max_output_tokens": 500, "temperature": 0.7},
+        ],
+    },
+}
+
+
+def load_policy(source: Optional[str] = None) -> Dict:
+    """Merge a JSON policy (inline, or a path to a file) over DEFAULT_POLICY
+
+    Reads ROUTING_POLICY when `source` is not given. Routes are replaced
+    whole; thresholds are merged key by key. Raises ValueError when the
+    merged policy is malformed.
+    """
+    policy = copy.deepcopy(DEFAULT_POLICY)
+    source = source if source is not None else os.getenv("ROUTING_POLICY", "")
+    if not source:
+        return policy
+
+    if os.path.exists(source):
+        with open(source, "r") as f:
+            override = json.load(f)
+    else:
+        override = json.loads(source)
+    if not isinstance(override, dict):
+        raise ValueError("routing policy must be a JSON object")
+
+    policy["enabled"] = override.get("enabled", policy["enabled"])
+    policy["thresholds"].update(override.get("thresholds", {}))
+    policy["routes"].update(override.get("routes", {}))
+    validate_policy(policy)
+    return policy
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_policy(policy: Dict):
+    """Raise ValueError unless `policy` has the shape QueryRouter expects"""
+    if not isinstance(policy.get("enabled"), bool):
+        raise ValueError("'enabled' must be true or false")
+
+    thresholds = policy.get("thresholds")
+    if not isinstance(thresholds, dict):
+        raise ValueError("'thresholds' must be an object")
+    for name in DEFAULT_POLICY["thresholds"]:
+        if not _is_number(thresholds.get(name)):
+            raise ValueError(f"threshold '{name}' must be a number")
+
+    routes = policy.get("routes")
+    if not isinstance(routes, dict):
+        raise ValueError("'routes' must be an object")
+    for route, targets in routes.items():
+        if not isinstance(targets, list):
+            raise ValueError(f"route '{route}' must be a list of targets")
+        for target in targets:
+            if not isinstance(target, dict) or not isinstance(target.get("provider"), str):
+                raise ValueError(f"every target of route '{route}' needs a 'provider' name")
+            if target.get("model") is not None and not isinstance(target["model"], str):
+                raise ValueError(f"'model' in route '{route}' must be a string or null")
+            for setting in ("max_output_tokens", "temperature"):
+                if setting in target and not _is_number(target[setting]):
+                    raise ValueError(f"'{setting}' in route '{route}' must be a number")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for providers that don't report usage"""
+    return (len(text) + 3) // 4
+
+
+class RouteMetrics:
+    """Per route and provider attempt counts, latency and estimated tokens
+
+    Abandoned attempts (the request stopped waiting) are counted separately and
+    kept out of the latency window; their tokens still count, as they are billed.
+    """
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._counters = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route: str, provider: str, latency_ms: float, success: bool,
+               prompt_tokens: int = 0, completion_tokens: int = 0, abandoned: bool = False):
+        key = f"{route}/{provider}"
+        with self._lock:
+            counters = self._counters[key]
+            counters["attempts"] += 1
+            counters["prompt_tokens_est"] += prompt_tokens
+            counters["completion_tokens_est"] += completion_tokens
+            if abandoned:
+                counters["abandoned"] += 1
+                return
+            counters["successes" if success else "failures"] += 1
+            self._latencies[key].append(latency_ms)
+
+    def record_route(self, route: str):
+        with self._lock:
+            self._counters[route]["requests"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            report = {}
+            for key, counters in self._counters.items():
+                entry = dict(counters)
+                latencies = sorted(self._latencies.get(key, ()))
+                if latencies:
+                    entry["latency_ms"] = {
+                        "p50": round(latencies[len(latencies) // 2], 1),
+                        "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                        "mean": round(sum(latencies) / len(latencies), 1),
+                    }
+                report[key] = entry
+            return report
+
+
+class QueryRouter:
+    """Pick a provider route per query from cheap local retrieval features
+
+    Easy queries (one clearly winning FAQ, short question) go to fast models
+    with a small output budget; everything else goes to the larger models.
+    Providers are plain callables, so tests can register stubs.
+    """
+
+    def __init__(self, policy: Dict, providers: Dict[str, Provider]):
+        self.policy = policy
+        self.providers = providers
+        self.metrics = RouteMetrics()
+
+    def features(self, question: str, faqs: List[Dict]) -> Dict:
+        thresholds = self.policy["thresholds"]
+        scores = [faq.get("score") for faq in faqs if faq.get("score") is not None]
+        top_score = scores[0] if scores else 0.0
+        second_score = scores[1] if len(scores) > 1 else 0.0
+        return {
+            "top_score": top_score,
+            "score_margin": round(top_score - second_score, 4),
+            "query_words": len(question.split()),
+            "matched_faqs": sum(1 for score in scores if score >= thresholds["match_score"]),
+        }
+
+    def classify(self, question: str, faqs: List[Dict]) -> Tuple[str, Dict]:
+        """Return the route name and the features it was chosen from"""
+        features = self.features(question, faqs)
+        if not self.policy.get("enabled", True):
+            return "hard", features
+
+        thresholds = self.policy["thresholds"]
+        easy = (
+            features["top_score"] >= thresholds["easy_min_top_score"]
+            and features["score_margin"] >= thresholds["easy_min_margin"]
+            and features["query_words"] <= thresholds["easy_max_query_words"]
+            and 1 <= features["matched_faqs"] <= thresholds["easy_max_matched"]
+        )
+        return ("easy" if easy else "hard"), features
+
+    def targets(self, route: str) -> List[Dict]:
+        """Route targets whose provider is registered, in policy order"""
+        return [target for target in self.policy["routes"].get(route, []) if target["provider"] in self.providers]
+
+    def generate(self, route: str, question: str, context: str, deadline=None,
+                 min_attempt_seconds: float = 0.0,
+                 abandoned: Optional[threading.Event] = None) -> Tuple[Optional[str], Optional[str], List[Dict]]:
+        """Try each target of `route` until one answers
+
+        With a `deadline` (anything with `remaining()` in seconds), a target is
+        only started while at least `min_attempt_seconds` remain. `abandoned` is
+        set by the caller once it stops waiting (or the deadline is cancelled);
+        an attempt that returns after that is recorded as abandoned, not as a
+        success or failure, and no further targets are tried. Returns
+        (answer, provider, attempts) where each attempt records the provider,
+        model, latency and outcome.
+        """
+        self.metrics.record_route(route)
+        attempts = []
+        prompt_tokens = estimate_tokens(question) + estimate_tokens(context)
+        for target in self.targets(route):
+            provider = target["provider"]
+            if deadline is not None and deadline.remaining() < min_attempt_seconds:
+                attempts.append({"provider": provider, "model": target.get("model"), "skipped": "deadline"})
+                break
+
+            start = time.perf_counter()
+            try:
+                answer = self.providers[provider](question, context, target)
+                error = None
+            except Exception as e:
+                answer, error = None, str(e)
+            latency_ms = (time.perf_counter() - start) * 1000
+            gave_up = (abandoned is not None and abandoned.is_set()) or getattr(deadline, "cancelled", False)
+
+            self.metrics.record(
+                route, provider, latency_ms, success=bool(answer),
+                prompt_tokens=prompt_tokens,
+                completion_tokens=estimate_tokens(answer) if answer else 0,
+                abandoned=gave_up
+            )
+            attempts.append({
+                "provider": provider,
+                "model": target.get("model"),
+                "latency_ms": round(latency_ms, 3),
+                "success": bool(answer) and not gave_up,
+                **({"abandoned": True} if gave_up else {}),
+                **({"error": error} if error else {}),
+            })
+            if gave_up:
+                break
+            if answer:
+                return answer, provider, attempts
+
+        return None, None, attempts
@@ -0,0 +1,151 @@
+import re
+from collections import Counter
+from typing import Dict, List, Set
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def within_distance(a: str, b: str, max_distance: int) -> bool:
+    """Bounded Damerau-Levenshtein (optimal string alignment) check
+
+    Adjacent transpositions ("retrun" for "return") count as one edit. Gives up
+    once a row exceeds `max_distance`.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return False
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        if min(current) > max_distance:
+            return False
+        before_previous, previous = previous, current
+    return previous[-1] <= max_distance
+
+
+def deletions(word: str, max_distance: int) -> Set[str]:
+    """`word` plus every string made by deleting up to `max_distance` characters"""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        found |= frontier
+    return found
+
+
+class SuggestionIndex:
+    """In-memory prefix index over FAQ questions for type-ahead suggestions
+
+    Every prefix of every question word maps to the FAQs containing it, so a
+    lookup is one dict access per typed word. Typos are looked up SymSpell-style:
+    every prefix is also indexed under its deletions (up to `max_fuzzy`), so
+    only prefixes sharing a deletion with the typed word are distance-checked.
+    Nothing is embedded and no LLM is called. The index is rebuilt by swapping
+    in new tables, so lookups never see a half-built index.
+    """
+
+    def __init__(self, max_prefix_length: int = 24, max_fuzzy: int = 2):
+        self.max_prefix_length = max_prefix_length
+        self.max_fuzzy = max_fuzzy
+        self.popularity: Counter = Counter()
+        self._faqs: List[Dict] = []
+        self._prefixes: Dict[str, Set[int]] = {}
+        self._words: Dict[str, Set[int]] = {}
+        self._deletions: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._faqs)
+
+    def build(self, faqs: List[Dict]):
+        """Index the `question` of each FAQ; call after populating the database"""
+        entries = []
+        prefixes: Dict[str, Set[int]] = {}
+        words: Dict[str, Set[int]] = {}
+        for position, faq in enumerate(faqs):
+            question = faq["question"]
+            entries.append({"id": faq.get("id"), "question": question, "normalized": " ".join(tokenize(question))})
+            for word in set(tokenize(question)):
+                words.setdefault(word, set()).add(position)
+                for end in range(1, min(len(word), self.max_prefix_length) + 1):
+                    prefixes.setdefault(word[:end], set()).add(position)
+
+        # Lists rather than sets: most variants belong to a single prefix, and this
+        # table dominates the index's memory
+        deletion_index: Dict[str, List[str]] = {}
+        for prefix in prefixes:
+            for variant in deletions(prefix, self.max_fuzzy):
+                deletion_index.setdefault(variant, []).append(prefix)
+
+        self._faqs, self._prefixes, self._words, self._deletions = entries, prefixes, words, deletion_index
+
+    def record_hit(self, faq_id: str):
+        """Count an FAQ as served so it ranks higher in suggestions"""
+        self.popularity[faq_id] += 1
+
+    def _matches(self, token: str, fuzzy: int) -> Set[int]:
+        matches = self._prefixes.get(token[:self.max_prefix_length])
+        if matches or not fuzzy:
+            return matches or set()
+
+        # Fuzzy fallback: any prefix within `fuzzy` edits shares a deletion variant
+        # with the typed word, so only those candidates need a distance check
+        fuzzy = min(fuzzy, self.max_fuzzy)
+        token = token[:self.max_prefix_length]
+        candidates: Set[str] = set()
+        for variant in deletions(token, fuzzy):
+            candidates.update(self._deletions.get(variant, ()))
+
+        found: Set[int] = set()
+        for prefix in candidates:
+            if within_distance(token, prefix, fuzzy):
+                found |= self._prefixes[prefix]
+        return found
+
+    def suggest(self, query: str, limit: int = 5, fuzzy: int = 0) -> List[Dict]:
+        """Return up to `limit` FAQ questions matching every word typed so far
+
+        Every word is matched as a prefix of some question word, so partially
+        typed words anywhere in the query still match. `fuzzy` allows that many
+        typos (including swapped adjacent letters) per word when a word has no
+        exact prefix match.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        candidates = None
+        for token in tokens:
+            matches = self._matches(token, fuzzy)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        normalized_query = " ".join(tokens)
+        whole_words = set(tokens[:-1])
+
+        def rank(position):
+            entry = self._faqs[position]
+            return (
+                not entry["normalized"].startswith(normalized_query),
+                -self.popularity[entry["id"]],
+                -sum(1 for word in whole_words if position in self._words.get(word, ())),
+                len(entry["question"]),
+            )
+
+        return [
+            {"id": self._faqs[position]["id"], "question": self._faqs[position]["question"]}
+            for position in sorted(candidates, key=rank)[:limit]
+        ]
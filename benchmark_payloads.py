@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark /ask payload size and serialization time
+
+Compares the previous response path (pydantic FAQResponse validation + JSON
+encoding) with the compact variants selectable through ?fields= and ?faqs=.
+Runs offline against data/faq_data.json - no server or database needed.
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+from responses import FAQResponse, brotli, dumps, orjson, parse_fields, shape_payload
+
+def build_payload(faq_data, n_results=3):
+    relevant = [
+        {"id": f"faq_{i}", "question": faq["question"], "answer": faq["answer"]}
+        for i, faq in enumerate(faq_data[:n_results])
+    ]
+    return {
+        "question": faq_data[0]["question"],
+        "answer": relevant[0]["answer"],
+        "relevant_faqs": relevant,
+        "confidence": "high",
+        "ai_provider": "gemini",
+        "langsmith_enabled": True
+    }
+
+def baseline(payload):
+    """What FastAPI did before: validate through the response model, then json.dumps"""
+    model = FAQResponse(**payload)
+    return json.dumps(model.model_dump(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def time_per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        body = func()
+    return (time.perf_counter() - start) / iterations * 1e6, body
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAQ bot response payloads")
+    parser.add_argument("--data", default=str(Path(__file__).parent / "data" / "faq_data.json"))
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(args.data, "r") as f:
+        payload = build_payload(json.load(f))
+
+    variants = {
+        "baseline (pydantic)": lambda: baseline(payload),
+        "full": lambda: dumps(shape_payload(payload)),
+        "faqs=ids": lambda: dumps(shape_payload(payload, faqs="ids")),
+        "fields=answer&faqs=none": lambda: dumps(shape_payload(payload, *parse_fields("answer", "none"))),
+    }
+
+    print(f"Serializer: {'orjson' if orjson else 'json'}  Brotli: {'yes' if brotli else 'not installed'}")
+    print(f"{'variant':<26}{'bytes':>8}{'gzip':>8}{'br':>8}{'µs/call':>10}{'bytes saved':>13}{'µs saved':>10}")
+
+    results = {name: time_per_call(func, args.iterations) for name, func in variants.items()}
+    base_us, base_body = results["baseline (pydantic)"]
+    for name, (us, body) in results.items():
+        gzip_size = len(gzip.compress(body, compresslevel=5))
+        br_size = len(brotli.compress(body, quality=4)) if brotli else "-"
+        print(f"{name:<26}{len(body):>8}{gzip_size:>8}{br_size:>8}{us:>10.2f}"
+              f"{len(base_body) - len(body):>13}{base_us - us:>10.2f}")
+
+if __name__ == "__main__":
+    main()
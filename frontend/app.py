@@ -1,14 +1,118 @@
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+import threading
 import time
 
+API_URL = os.getenv("FAQ_API_URL", "http://localhost:8000")
+MAX_HISTORY = 50  # Messages kept per browser session
+QUICK_ANSWER_TTL = 600  # Seconds a quick-action answer is reused across sessions
+DEGRADED_ANSWER_TTL = 30  # Same, for answers the backend degraded under its deadline
+ASK_TIMEOUT = 10  # Seconds before the frontend gives up on /ask
+# Backend budget, kept below ASK_TIMEOUT so a degraded answer arrives in time
+ASK_DEADLINE_MS = 9000
+# Longest a rerun waits on an in-flight answer before refreshing the page
+ANSWER_POLL_SECONDS = 1.0
+
+# Only the fields the UI shows, without FAQ bodies
+ASK_PARAMS = {"fields": "answer,ai_provider,confidence", "faqs": "none"}
+
 st.set_page_config(
     page_title="FAQ Bot",
     page_icon="🤖",
     layout="wide"
 )
 
+class APIError(Exception):
+    """Raised for failed API calls so st.cache_data never caches an error"""
+
+class AnswerCache:
+    """TTL cache for quick-action answers, shared by every session in this process"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, question: str):
+        with self._lock:
+            entry = self._entries.get(question)
+        if entry and entry[0] > time.time():
+            return entry[1]
+        return None
+
+    def set(self, question: str, result: dict, ttl: int = None):
+        with self._lock:
+            self._entries[question] = (time.time() + (self.ttl if ttl is None else ttl), result)
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """One pooled HTTP session per Streamlit server process"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=64)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Worker threads that run /ask calls off the script thread"""
+    return ThreadPoolExecutor(max_workers=32, thread_name_prefix="faq-ask")
+
+@st.cache_resource
+def get_answer_cache() -> AnswerCache:
+    return AnswerCache(ttl=QUICK_ANSWER_TTL)
+
+@st.cache_data(ttl=10, show_spinner=False)
+def fetch_health() -> dict:
+    try:
+        response = get_http_session().get(f"{API_URL}/health", timeout=5)
+    except requests.RequestException as e:
+        raise APIError(f"Connection Error: {e}")
+    if response.status_code != 200:
+        raise APIError(f"API Error: {response.status_code}")
+    return response.json()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_faqs() -> list:
+    try:
+        response = get_http_session().get(f"{API_URL}/faqs", timeout=5)
+    except requests.RequestException as e:
+        raise APIError(f"Connection Error: {e}")
+    if response.status_code != 200:
+        raise APIError(f"API Error: {response.status_code}")
+    return response.json().get("faqs", [])
+
+def ask_api(session: requests.Session, question: str, cache: AnswerCache = None) -> dict:
+    """Call /ask; runs in a worker thread, so it must not touch st.* APIs"""
+    if cache is not None:
+        cached = cache.get(question)
+        if cached is not None:
+            return cached
+
+    try:
+        response = session.post(
+            f"{API_URL}/ask",
+            params=ASK_PARAMS,
+            json={"question": question},
+            headers={"X-Request-Deadline-Ms": str(ASK_DEADLINE_MS)},
+            timeout=ASK_TIMEOUT
+        )
+        if response.status_code != 200:
+            return {"error": f"API Error: {response.status_code}"}
+        result = response.json()
+    except Exception as e:
+        return {"error": f"Connection Error: {str(e)}"}
+
+    if cache is not None:
+        # A deadline-degraded answer is kept only briefly so one slow moment
+        # isn't served to every session for the full TTL
+        degraded = response.headers.get("X-Degraded")
+        cache.set(question, result, ttl=DEGRADED_ANSWER_TTL if degraded else None)
+    return result
+
 # Rate limiting protection
 if 'last_request_time' not in st.session_state:
     st.session_state.last_request_time = 0
@@ -19,28 +123,34 @@ def can_make_request():
     time_since_last = current_time - st.session_state.last_request_time
     return time_since_last > 2  # Wait 2 seconds between requests
 
-def get_faq_response(question: str):
-    """Get response with rate limiting"""
+def submit_question(question: str, quick_action: bool = False):
+    """Start fetching an answer in the background; the page keeps rendering meanwhile"""
+    if st.session_state.pending is not None:
+        return {"error": "Still waiting for the previous answer"}
     if not can_make_request():
         return {"error": "Please wait a moment before asking another question"}
 
-    try:
-        st.session_state.last_request_time = time.time()
-        response = requests.post(
-            "http://localhost:8000/ask",
-            json={"question": question},
-            timeout=10
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return {"error": f"API Error: {response.status_code}"}
-    except Exception as e:
-        return {"error": f"Connection Error: {str(e)}"}
+    st.session_state.last_request_time = time.time()
+    cache = get_answer_cache() if quick_action else None
+    future = get_executor().submit(ask_api, get_http_session(), question, cache)
+    st.session_state.pending = {"question": question, "future": future}
+    return None
+
+def add_message(question: str, result: dict):
+    st.session_state.messages.append({
+        "question": question,
+        "answer": result.get("answer", "No answer available"),
+        "ai_provider": result.get("ai_provider", "unknown"),
+        "confidence": result.get("confidence", "unknown")
+    })
+    # Keep per-session memory bounded
+    del st.session_state.messages[:-MAX_HISTORY]
 
 # Initialize session state
 if 'messages' not in st.session_state:
     st.session_state.messages = []
+if 'pending' not in st.session_state:
+    st.session_state.pending = None
 
 # Sidebar
 with st.sidebar:
@@ -51,19 +161,23 @@ with st.sidebar:
     st.write("• FastAPI backend")
     st.write("• Streamlit interface")
 
-    # API Status check (with rate limiting)
+    # API Status check (cached briefly so repeated clicks don't hit the API)
     if st.button("Check API Status"):
         try:
-            response = requests.get("http://localhost:8000/health", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                st.success("✅ API Connected")
-                st.info(f"Database entries: {data.get('database_entries', 'Unknown')}")
-            else:
-                st.error("❌ API Error")
-        except:
+            data = fetch_health()
+            st.success("✅ API Connected")
+            st.info(f"Database entries: {data.get('database_entries', 'Unknown')}")
+        except APIError:
             st.error("❌ API Disconnected")
 
+    if st.checkbox("📚 Browse FAQs"):
+        try:
+            for faq in fetch_faqs():
+                with st.expander(faq.get("question", "Unknown")):
+                    st.write(faq.get("answer", ""))
+        except APIError as e:
+            st.error(str(e))
+
     if st.button("🗑️ Clear Chat"):
         st.session_state.messages = []
         st.rerun()
@@ -78,60 +192,36 @@ with st.form("question_form", clear_on_submit=True):
     submitted = st.form_submit_button("Ask Question", type="primary")
 
     if submitted and question:
-        with st.spinner("Getting answer..."):
-            result = get_faq_response(question)
-
-            if "error" in result:
-                st.error(result["error"])
-            else:
-                # Add to chat history
-                st.session_state.messages.append({
-                    "question": question,
-                    "answer": result.get("answer", "No answer available"),
-                    "ai_provider": result.get("ai_provider", "unknown"),
-                    "confidence": result.get("confidence", "unknown")
-                })
-                st.rerun()
-
-# Quick action buttons (with rate limiting protection)
+        result = submit_question(question)
+        if result and "error" in result:
+            st.error(result["error"])
+
+# Quick action buttons (answers are cached and shared across sessions)
 st.subheader("🚀 Quick Actions")
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    if st.button("Return Policy") and can_make_request():
-        result = get_faq_response("What is your return policy?")
-        if "error" not in result:
-            st.session_state.messages.append({
-                "question": "What is your return policy?",
-                "answer": result.get("answer", "No answer available"),
-                "ai_provider": result.get("ai_provider", "unknown"),
-                "confidence": result.get("confidence", "unknown")
-            })
-            st.rerun()
-
-with col2:
-    if st.button("Shipping Info") and can_make_request():
-        result = get_faq_response("How long does shipping take?")
-        if "error" not in result:
-            st.session_state.messages.append({
-                "question": "How long does shipping take?",
-                "answer": result.get("answer", "No answer available"),
-                "ai_provider": result.get("ai_provider", "unknown"),
-                "confidence": result.get("confidence", "unknown")
-            })
-            st.rerun()
-
-with col3:
-    if st.button("Support Contact") and can_make_request():
-        result = get_faq_response("How can I contact support?")
-        if "error" not in result:
-            st.session_state.messages.append({
-                "question": "How can I contact support?",
-                "answer": result.get("answer", "No answer available"),
-                "ai_provider": result.get("ai_provider", "unknown"),
-                "confidence": result.get("confidence", "unknown")
-            })
-            st.rerun()
+quick_actions = [
+    ("Return Policy", "What is your return policy?"),
+    ("Shipping Info", "How long does shipping take?"),
+    ("Support Contact", "How can I contact support?"),
+]
+for column, (label, quick_question) in zip(st.columns(len(quick_actions)), quick_actions):
+    with column:
+        if st.button(label):
+            result = submit_question(quick_question, quick_action=True)
+            if result and "error" in result:
+                st.warning(result["error"])
+
+# Collect a finished answer, or show progress while it is in flight
+pending = st.session_state.pending
+if pending is not None:
+    if pending["future"].done():
+        st.session_state.pending = None
+        result = pending["future"].result()
+        if "error" in result:
+            st.error(result["error"])
+        else:
+            add_message(pending["question"], result)
+    else:
+        st.info(f"⏳ Getting answer for: {pending['question']}")
 
 # Display chat history
 if st.session_state.messages:
@@ -155,4 +245,11 @@ if not can_make_request():
     st.warning("⏳ Please wait a moment before asking another question (rate limiting)")
 
 st.markdown("---")
-st.markdown("Made with ❤️ using Streamlit, FastAPI, ChromaDB, and AI")
\ No newline at end of file
+st.markdown("Made with ❤️ using Streamlit, FastAPI, ChromaDB, and AI")
+
+# The page is fully rendered; wait for the in-flight answer in slices of at most
+# ANSWER_POLL_SECONDS, returning as soon as it lands, then rerun to show it.
+# User interaction still interrupts the wait.
+if st.session_state.pending is not None:
+    wait([st.session_state.pending["future"]], timeout=ANSWER_POLL_SECONDS)
+    st.rerun()
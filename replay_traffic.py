@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Replay captured /ask traffic against a local server with its original timing
+
+Reads the JSON request logs written by the backend (set REQUEST_LOG_FILE to
+capture them) and re-sends each question, preserving inter-arrival gaps. The
+original `fields`/`faqs` query parameters and deadline budget are sent too, so
+payload shaping and deadline degradation behave as they did when captured.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+def load_requests(log_path, endpoint="ask"):
+    """Load replayable request records, ordered by arrival time"""
+    records = []
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Skip non-JSON lines (startup prints, tracebacks)
+            if record.get("event") == endpoint and record.get("question") and record.get("arrived_at"):
+                records.append(record)
+    records.sort(key=lambda record: record["arrived_at"])
+    return records
+
+def replay(records, base_url, speed=1.0, max_workers=64, timeout=30):
+    """Send each record at its original offset (scaled by `speed`) and collect results"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    results = []
+    lock = threading.Lock()
+
+    def send(record):
+        headers = {"X-Request-ID": f"replay-{record['request_id']}"}
+        if record.get("deadline_ms"):
+            headers["X-Request-Deadline-Ms"] = str(record["deadline_ms"])
+        start = time.perf_counter()
+        try:
+            response = session.post(
+                f"{base_url}/ask",
+                params=record.get("params") or None,
+                json={"question": record["question"]},
+                headers=headers,
+                timeout=timeout
+            )
+            status = response.status_code
+            provider = response.json().get("ai_provider") if status == 200 else None
+        except Exception as e:
+            status, provider = f"error: {e}", None
+        latency_ms = (time.perf_counter() - start) * 1000
+        with lock:
+            results.append({
+                "request_id": record["request_id"],
+                "status": status,
+                "provider": provider,
+                "latency_ms": latency_ms,
+                "original_ms": record.get("total_ms")
+            })
+
+    first_arrival = records[0]["arrived_at"]
+    replay_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for record in records:
+            offset = (record["arrived_at"] - first_arrival) / speed
+            delay = offset - (time.perf_counter() - replay_start)
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, record)
+
+    return results
+
+def summarize(results):
+    latencies = sorted(result["latency_ms"] for result in results)
+    errors = [result for result in results if result["status"] != 200]
+    providers = {}
+    for result in results:
+        providers[result["provider"]] = providers.get(result["provider"], 0) + 1
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    print("=== Replay Summary ===")
+    print(f"Requests: {len(results)}  Errors: {len(errors)}")
+    print(f"Latency ms: p50={percentile(0.5):.1f} p95={percentile(0.95):.1f} "
+          f"p99={percentile(0.99):.1f} mean={statistics.mean(latencies):.1f}")
+    original = [result["original_ms"] for result in results if result["original_ms"] is not None]
+    if original:
+        print(f"Original mean latency ms: {statistics.mean(original):.1f}")
+    print(f"Providers: {providers}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured FAQ bot traffic")
+    parser.add_argument("log_file", help="JSON request log written with REQUEST_LOG_FILE")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression factor (2.0 = twice as fast)")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N requests")
+    parser.add_argument("--workers", type=int, default=64, help="Maximum requests in flight")
+    parser.add_argument("--output", help="Write per-request results as JSON lines")
+    args = parser.parse_args()
+
+    records = load_requests(args.log_file)[:args.limit]
+    if not records:
+        print("❌ No replayable /ask records found")
+        return
+
+    sampled = [record for record in records if record.get("sample_weight", 1) > 1]
+    if sampled:
+        represented = sum(record.get("sample_weight", 1) for record in records)
+        print(f"⚠️  {len(sampled)} records were captured while log sampling was active; "
+              f"this log holds about {len(records) / represented:.0%} of the original traffic. "
+              "Capture with REQUEST_LOG_SAMPLE_RATE=1 to replay the full load.")
+
+    span = records[-1]["arrived_at"] - records[0]["arrived_at"]
+    print(f"🔁 Replaying {len(records)} requests spanning {span:.1f}s at {args.speed}x against {args.base_url}")
+    results = replay(records, args.base_url, speed=args.speed, max_workers=args.workers)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+
+    summarize(results)
+
+if __name__ == "__main__":
+    main()
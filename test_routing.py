@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Offline checks for the query router using stub providers
+"""
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from routing import QueryRouter, load_policy
+
+def faqs(*scores):
+    return [{"id": f"faq_{i}", "score": score} for i, score in enumerate(scores)]
+
+class StubDeadline:
+    def __init__(self, remaining):
+        self._remaining = remaining
+        self.cancelled = False
+
+    def remaining(self):
+        return self._remaining
+
+def make_router(**providers):
+    return QueryRouter(load_policy(""), providers=providers)
+
+def test_classify_thresholds():
+    router = make_router()
+    # One clear winner and a short question is easy
+    assert router.classify("What is your return policy?", faqs(0.8, 0.4))[0] == "easy"
+    # Too close to the runner-up, too weak a match, or too long a question is hard
+    assert router.classify("What is your return policy?", faqs(0.8, 0.76))[0] == "hard"
+    assert router.classify("What is your return policy?", faqs(0.5, 0.1))[0] == "hard"
+    long_question = "I bought something last month and it arrived damaged so can I get my money back"
+    assert router.classify(long_question, faqs(0.8, 0.4))[0] == "hard"
+
+    disabled = QueryRouter(load_policy('{"enabled": false}'), providers={})
+    assert disabled.classify("What is your return policy?", faqs(0.8, 0.4))[0] == "hard"
+
+def test_failover_to_next_target():
+    def broken(question, context, target):
+        raise RuntimeError("quota exceeded")
+
+    def working(question, context, target):
+        return f"answer from {target['model']}"
+
+    router = make_router(openai=broken, gemini=working)
+    answer, provider, attempts = router.generate("hard", "question", "context")
+    assert provider == "gemini"
+    assert answer == "answer from None"
+    assert [attempt["success"] for attempt in attempts] == [False, True]
+    assert attempts[0]["error"] == "quota exceeded"
+    assert router.metrics.stats()["hard/openai"]["failures"] == 1
+
+def test_deadline_skips_remaining_targets():
+    calls = []
+
+    def provider(question, context, target):
+        calls.append(target["provider"])
+        return "answer"
+
+    router = make_router(openai=provider, gemini=provider)
+    answer, provider_name, attempts = router.generate(
+        "hard", "question", "context", deadline=StubDeadline(remaining=0.5), min_attempt_seconds=1.5
+    )
+    assert answer is None and provider_name is None
+    assert calls == []
+    assert attempts[0]["skipped"] == "deadline"
+
+def test_abandoned_attempt_is_not_a_success():
+    abandoned = threading.Event()
+
+    def late(question, context, target):
+        abandoned.set()  # The caller gave up while this call was running
+        return "late answer"
+
+    router = make_router(openai=late, gemini=late)
+    answer, provider, attempts = router.generate("hard", "question", "context", abandoned=abandoned)
+    assert answer is None
+    assert len(attempts) == 1 and attempts[0]["abandoned"]
+    stats = router.metrics.stats()["hard/openai"]
+    assert stats["abandoned"] == 1
+    assert "successes" not in stats and "latency_ms" not in stats
+
+def test_invalid_policy_is_rejected():
+    for source in ('{"routes": {"easy": [{"model": "x"}]}}', '{"enabled": "yes"}', "[]"):
+        try:
+            load_policy(source)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted invalid policy {source}")
+
+if __name__ == "__main__":
+    test_classify_thresholds()
+    test_failover_to_next_target()
+    test_deadline_skips_remaining_targets()
+    test_abandoned_attempt_is_not_a_success()
+    test_invalid_policy_is_rejected()
+    print("✅ Routing tests passed")
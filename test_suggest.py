@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Offline checks for the /suggest prefix index, including lookup time at a
+realistic corpus size
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from suggest import SuggestionIndex, within_distance
+
+FAQS = [
+    {"id": "faq_0", "question": "What is your return policy?"},
+    {"id": "faq_1", "question": "How long does shipping take?"},
+    {"id": "faq_2", "question": "What payment methods do you accept?"},
+]
+
+# Fuzzy lookups must stay well under this even on a 1,000 FAQ index
+MAX_LOOKUP_MS = 20
+
+def build_index(faqs):
+    index = SuggestionIndex()
+    index.build(faqs)
+    return index
+
+def test_prefix_and_typos():
+    index = build_index(FAQS)
+    assert index.suggest("ret pol")[0]["id"] == "faq_0"
+    assert index.suggest("retrn pol", fuzzy=1)[0]["id"] == "faq_0"
+    # Swapped adjacent letters count as one edit
+    assert index.suggest("retrun pol", fuzzy=1)[0]["id"] == "faq_0"
+    assert index.suggest("shpiping", fuzzy=1)[0]["id"] == "faq_1"
+    assert index.suggest("retrun pol") == []
+
+def test_within_distance():
+    assert within_distance("retrun", "return", 1)
+    assert not within_distance("abc", "cba", 1)
+    assert within_distance("kitten", "sitting", 3)
+
+def test_fuzzy_lookup_time_at_corpus_size():
+    rng = random.Random(7)
+    vocab = list({"".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 11))) for _ in range(2800)})
+    faqs = [{"id": f"faq_{i}", "question": " ".join(rng.sample(vocab, rng.randint(5, 12)))} for i in range(1000)]
+    index = build_index(faqs)
+
+    # Words with no exact prefix match take the fuzzy path
+    queries = ["qzxq wvvk", vocab[0][::-1], vocab[1][:4] + "x " + vocab[2][:3]]
+    for fuzzy in (1, 2):
+        for query in queries:
+            start = time.perf_counter()
+            index.suggest(query, fuzzy=fuzzy)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            assert elapsed_ms < MAX_LOOKUP_MS, f"{query!r} fuzzy={fuzzy} took {elapsed_ms:.1f}ms"
+
+if __name__ == "__main__":
+    test_prefix_and_typos()
+    test_within_distance()
+    test_fuzzy_lookup_time_at_corpus_size()
+    print("✅ Suggestion index tests passed")